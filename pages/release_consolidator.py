@@ -14,13 +14,18 @@ implemented later.
 
 from __future__ import annotations
 
-import base64
-import json
-import uuid
+import binascii
+import math
+import os
+import re
+from html import escape
+from itertools import islice
 from typing import Dict, List
 
 import streamlit as st
 
+from reno.common import json_loads
+
 
 # ---------------------------------------------------------------------------
 # Page configuration
@@ -36,35 +41,171 @@ st.title("Reno – Release Note Consolidator")
 # ---------------------------------------------------------------------------
 
 
-def _safe_rerun():
-    """Trigger a rerun whatever the Streamlit version is."""
-
-    if hasattr(st, "rerun"):
-        st.rerun()
-    else:
-        st.experimental_rerun()
+# Standard base-64 alphabet with at most two trailing padding characters.
+_B64_RE = re.compile(r"[A-Za-z0-9+/]+={0,2}")
 
 
+@st.cache_data(show_spinner=False, max_entries=1024)
 def _decode_b64_to_json(b64_str: str) -> Dict:
     """Decode a base-64 string produced by the generator back to a dict.
 
+    Obviously malformed input is rejected by a cheap length / alphabet check
+    before anything is decoded.  Results are memoised per input string;
+    `st.cache_data` hands back a fresh copy on every call, so callers may
+    safely mutate the returned dict.
+
     Raises
     ------
     ValueError
-        If the string cannot be decoded / parsed.
+        If the string cannot be decoded / parsed, or is not a release note
+        object.
     """
 
+    b64_str = "".join(b64_str.split())
+    if len(b64_str) % 4 or not _B64_RE.fullmatch(b64_str):
+        raise ValueError("Invalid base64 encoded JSON.")
+
     try:
-        decoded = base64.b64decode(b64_str).decode()
-        return json.loads(decoded)
-    except Exception as err:
+        # The alphabet is already validated above, so go straight to the C
+        # decoder rather than through `base64.b64decode(validate=True)`.
+        data = json_loads(binascii.a2b_base64(b64_str))
+    except ValueError as err:
         raise ValueError("Invalid base64 encoded JSON.") from err
 
+    # Valid JSON is not necessarily a release note – the card renderer needs
+    # an object whose (optional) `services` entry maps names to objects.
+    if not isinstance(data, dict):
+        raise ValueError("Base64 JSON is not a release note.")
+    services = data.get("services", {})
+    if not isinstance(services, dict) or not all(
+        isinstance(details, dict) for details in services.values()
+    ):
+        raise ValueError("Base64 JSON is not a release note.")
+    return data
+
+
+# Per-service fields shown on a card, in display order, and their labels.
+FIELD_ORDER = (
+    "config_only",
+    "risk_level",
+    "benefit_level",
+    "version",
+    "change_description",
+    "known_issues",
+    "pr_links",
+    "design_links",
+    "code_quality_links",
+    "additional_links",
+)
+FIELD_LABELS = {
+    "config_only": "Config only",
+    "risk_level": "Risk level",
+    "benefit_level": "Benefit",
+    "version": "Version",
+    "change_description": "Change description",
+    "known_issues": "Known issues, risks and mitigations",
+    "pr_links": "PR links",
+    "design_links": "Design links",
+    "code_quality_links": "Code quality links",
+    "additional_links": "Additional links",
+}
+
+# Link list items starting with one of these are rendered as anchors.
+_URL_PREFIXES = ("http://", "https://")
+
+
+def _escape_text(value) -> str:
+    """HTML-escape `value` and turn its line breaks into ``<br>``.
+
+    Card HTML goes through `st.markdown`, where a blank line ends the raw HTML
+    block and the rest is parsed as Markdown – so no raw newline may survive.
+    """
+
+    return (
+        escape(str(value))
+        .replace("\r\n", "\n")
+        .replace("\r", "\n")
+        .replace("\n", "<br>")
+    )
+
+
+# Sentinel for fields missing from a note (distinct from falsy values).
+_MISSING = object()
+
+
+@st.cache_data(show_spinner=False, max_entries=1024)
+def _render_note_html(data: Dict) -> str:
+    """Return the full HTML for one release note card.
+
+    Each card is a native ``<details>`` element – the browser handles
+    expanding it, so no React component is needed per note and every card can
+    be emitted in a single `st.markdown`.  Note data never changes after it has
+    been added, so this is called once per note (at add time) and the result is
+    stored alongside the note; the card number comes from a CSS counter so the
+    HTML stays valid when other notes are deleted.
+    """
+
+    services_map = data.get("services", {}) or {}
+    service_names = list(services_map)
+    services = " | ".join(service_names) or "-"
+    summary_label = f"Release Note: {data.get('release_date', 'N/A')}"
+    summary_info = (
+        f"Services in release: {services} · Point of contact: {data.get('contact', '-')}"
+    )
+
+    parts: List[str] = [
+        f"<details class='reno-card'><summary><strong>{_escape_text(summary_label)}</strong>"
+        f"<br><small>{_escape_text(summary_info)}</small></summary>"
+    ]
+    if service_names:
+        parts.append('<div style="margin-top:0.5rem">')
+        for svc in service_names:
+            details = services_map.get(svc, {}) or {}
+            parts.append(
+                f"<p style='margin:0.75rem 0 0.25rem'><strong>{_escape_text(svc)}</strong></p>"
+                "<ul style='margin:0'>"
+            )
+            for field in FIELD_ORDER:
+                value = details.get(field, _MISSING)
+                if value is _MISSING:
+                    continue
+                label = FIELD_LABELS[field]
+
+                if isinstance(value, list):
+                    if not value:
+                        continue
+                    parts.append(f"<li>{label}:<ul>")
+                    for item in value:
+                        item = str(item)
+                        escaped = _escape_text(item)
+                        if item.startswith(_URL_PREFIXES):
+                            parts.append(
+                                f"<li><a href='{escaped}' target='_blank'>{escaped}</a></li>"
+                            )
+                        else:
+                            parts.append(f"<li>{escaped}</li>")
+                    parts.append("</ul></li>")
+                elif isinstance(value, bool):
+                    parts.append(f"<li>{label}: {'Yes' if value else 'No'}</li>")
+                elif value:
+                    parts.append(f"<li>{label}: {_escape_text(value)}</li>")
+            parts.append("</ul>")
+        parts.append("</div>")
+    parts.append("</details>")
+
+    # One join instead of repeated `+=` keeps the build linear in output size.
+    return "".join(parts)
+
 
 # Initialise session state
 if "release_notes" not in st.session_state:
-    # Each entry is {id: str, data: dict}
-    st.session_state["release_notes"]: List[Dict] = []
+    # {note_id: {id: str, data: dict, html: str}} – dicts keep insertion order,
+    # so this renders in the order notes were added while deletes stay O(1).
+    st.session_state["release_notes"]: Dict[str, Dict] = {}
+
+# Note ids only need to be unique within the session (they key the delete
+# buttons), so a counter is enough – no need for uuid4 / os.urandom.
+st.session_state.setdefault("_note_seq", 0)
 
 
 # ---------------------------------------------------------------------------
@@ -87,17 +228,22 @@ with st.sidebar:
 
         b64_strings = [line.strip() for line in raw_input.splitlines() if line.strip()]
 
-        successes, failures = 0, 0
+        new_notes: Dict[str, Dict] = {}
+        failures = 0
 
         for b64 in b64_strings:
             try:
                 data = _decode_b64_to_json(b64)
-                st.session_state["release_notes"].append(
-                    {"id": str(uuid.uuid4()), "data": data}
-                )
-                successes += 1
             except ValueError:
                 failures += 1
+                continue
+            st.session_state["_note_seq"] += 1
+            note_id = f"n{st.session_state['_note_seq']}"
+            new_notes[note_id] = {"id": note_id, "data": data, "html": _render_note_html(data)}
+
+        # Single session-state write for the whole batch.
+        st.session_state["release_notes"].update(new_notes)
+        successes = len(new_notes)
 
         if successes:
             st.success(f"Added {successes} release note(s) to the consolidator.")
@@ -106,7 +252,7 @@ with st.sidebar:
                 f"{failures} string(s) could not be decoded – please verify they are valid."
             )
 
-        # Clear input for next add and rerun to refresh UI
+        # Clear input for next add – Streamlit reruns after the callback anyway.
         st.session_state["input_b64_sidebar"] = ""
 
     st.button(
@@ -117,9 +263,9 @@ with st.sidebar:
     )
     # Clear all notes and reset input
     def _on_clear_click():
-        st.session_state["release_notes"] = []
+        st.session_state["release_notes"] = {}
         st.session_state["input_b64_sidebar"] = ""
-        _safe_rerun()
+        # No explicit rerun needed: the script reruns once the callback returns.
     st.button(
         "Clear Form",
         key="clear_form",
@@ -133,6 +279,35 @@ with st.sidebar:
 # ---------------------------------------------------------------------------
 
 
+# Only one page of cards is built and rendered per rerun.
+NOTES_PER_PAGE = 20
+
+# Delete buttons are laid out below the cards, this many per row.
+DELETE_BUTTONS_PER_ROW = 6
+
+
+CARD_CSS = """
+<style>
+.reno-cards {counter-reset: reno-card;}
+.reno-card {
+    counter-increment: reno-card;
+    border: 1px solid rgba(49, 51, 63, 0.2);
+    border-radius: 0.5rem;
+    padding: 0.75rem 1rem;
+    margin-bottom: 1rem;
+    overflow-wrap: anywhere;
+}
+.reno-card > summary {cursor: pointer;}
+.reno-card > summary strong::before {content: "#" counter(reno-card) " ";}
+.reno-card > summary small {color: rgba(49, 51, 63, 0.6);}
+</style>
+"""
+
+
+def _on_delete_click(note_id: str):
+    st.session_state["release_notes"].pop(note_id, None)
+
+
 if not st.session_state["release_notes"]:
     st.info(
         "Use the sidebar to paste Base-64 encoded release notes (exported from the "
@@ -143,28 +318,47 @@ else:
     # Inject card styling – ensure long content wraps inside the card
     # ------------------------------------------------------------------
 
-    # We copy the list because we might mutate the session state while iterating.
-    for note in list(st.session_state["release_notes"]):
-        # Wrap each note in a styled card container – use custom CSS class so we can
-        # control layout easily (e.g. wrapping of long content).
-        data = note["data"]
-        st.json(note)
-        
-        with st.container(border=True):
-            st.subheader(f"Release Note: {data['release_date']}", divider="gray")
+    st.markdown(CARD_CSS, unsafe_allow_html=True)
 
-            service_names = list(data.get("services", {}).keys())
-            services = " | ".join(service_names) or "-"
-            st.text(f"Services in release:  {services}")
-            st.text(f"Point of contact:  {data['contact']}")
+    notes = st.session_state["release_notes"]
 
-            with st.expander("Release Details..."):
-                tabs = st.tabs(service_names)
-                for tab in tabs:
-                    with tab:
-                        st.text("words")
+    # Paginate so HTML building and DOM size scale with the page, not with the
+    # whole collection.
+    page_count = math.ceil(len(notes) / NOTES_PER_PAGE)
+    if page_count > 1:
+        # Deleting notes can shrink the page count below the current page.
+        if st.session_state.get("notes_page", 1) > page_count:
+            st.session_state["notes_page"] = page_count
+        page = st.number_input("Page", min_value=1, max_value=page_count, key="notes_page")
+    else:
+        page = 1
+
+    start = (page - 1) * NOTES_PER_PAGE
+    page_notes = list(islice(notes.values(), start, start + NOTES_PER_PAGE))
+
+    # One element for all cards instead of several per note.
+    # The counter reset makes the CSS card numbers match the delete buttons.
+    # Stored card HTML never contains a raw newline (see `_escape_text`), so
+    # one note cannot end the HTML block for the cards that follow it.
+    st.markdown(
+        f"<div class='reno-cards' style='counter-reset: reno-card {start}'>"
+        + "".join(note["html"] for note in page_notes)
+        + "</div>",
+        unsafe_allow_html=True,
+    )
 
-                
+    st.caption("Remove a release note")
+    for row_start in range(0, len(page_notes), DELETE_BUTTONS_PER_ROW):
+        row = page_notes[row_start : row_start + DELETE_BUTTONS_PER_ROW]
+        for offset, (col, note) in enumerate(zip(st.columns(DELETE_BUTTONS_PER_ROW), row)):
+            with col:
+                st.button(
+                    f"✖ #{start + row_start + offset + 1}",
+                    key=f"delete_{note['id']}",
+                    on_click=_on_delete_click,
+                    args=(note["id"],),
+                    use_container_width=True,
+                )
 
 
 # ---------------------------------------------------------------------------
@@ -172,6 +366,25 @@ else:
 # ---------------------------------------------------------------------------
 
 
-with st.sidebar.expander("Debug – session state", expanded=False):
-    # Helpful when developing the page – hidden by default.
-    st.json({k: v for k, v in st.session_state.items() if k == "release_notes"})
+# Values that switch debug output on; anything else (including "0") leaves it off.
+_DEBUG_TRUTHY = {"1", "true", "yes"}
+
+
+def _debug_enabled() -> bool:
+    """Debug output is opt-in via ``RENO_DEBUG=1`` or a ``?debug=1`` query param."""
+
+    if os.environ.get("RENO_DEBUG", "").strip().lower() in _DEBUG_TRUTHY:
+        return True
+    query_params = getattr(st, "query_params", None)
+    if query_params is None:
+        return False
+    return str(query_params.get("debug", "")).strip().lower() in _DEBUG_TRUTHY
+
+
+# Helpful when developing the page.  The payload is only built once the box is
+# ticked – a collapsed expander would still serialise it on every rerun.
+if _debug_enabled() and st.sidebar.checkbox("Debug – show session state", value=False):
+    st.sidebar.json(
+        {"release_notes": st.session_state.get("release_notes", {})},
+        expanded=False,
+    )
@@ -1,9 +1,10 @@
 """
 Reno – Release Note Generator (moved from the original single-page app).
 
-This is the exact content that previously lived in `app.py`.  Apart from
-updating the title in `st.set_page_config` to match the page name, the
-implementation is unchanged.
+Builds one release note from per-service form inputs, previews it as JSON and
+exports it as base64 for the consolidator page.  A previously exported note
+can be pasted back in to continue editing it.  Shared helpers live in
+`reno.common`.
 """
 
 import streamlit as st
@@ -11,21 +12,17 @@ import streamlit as st
 # Page configuration MUST be set before any other Streamlit calls.
 st.set_page_config(page_title="Release Note Generator", page_icon="📝", layout="wide")
 
-import toml
-import json
 import base64
 from datetime import date
 
-
-# Utility to trigger a rerun regardless of Streamlit version.
-
-
-def _safe_rerun():
-    """Trigger a script rerun using whichever API is available."""
-    if hasattr(st, "rerun"):
-        st.rerun()
-    else:
-        st.experimental_rerun()
+from reno.common import (
+    fragment,
+    json_dumps,
+    json_loads,
+    load_config,
+    parse_links,
+    safe_rerun,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -33,12 +30,39 @@ def _safe_rerun():
 # ---------------------------------------------------------------------------
 
 
-@st.cache_data
-def load_config():
-    return toml.load("config.toml")
+config = load_config()
 
+CONTACTS = config.get("contacts", {}).get("names", [])
+SERVICES = config.get("services", {}).get("names", [])
 
-config = load_config()
+# Above this many selected services a single panel replaces the tabs.
+MAX_SERVICE_TABS = 5
+
+# Session-state keys owned by the form – "Clear Form" resets only these so that
+# Streamlit's own bookkeeping (and other pages' state) is left untouched.
+FORM_KEYS = (
+    "release_date",
+    "contact",
+    "selected_services",
+    "input_b64",
+    "_active_svc",
+)
+
+# Per-service fields, stored in session state as `{svc}_{field}`.  Scalars map
+# straight onto a widget value (with its default); list fields are edited as
+# one-link-per-line text.
+SCALAR_FIELDS = (
+    ("config_only", False),
+    ("risk_level", "Low"),
+    ("benefit_level", "Low"),
+    ("version", ""),
+    ("known_issues", ""),
+    ("change_description", ""),
+)
+LIST_FIELDS = ("pr_links", "design_links", "code_quality_links", "additional_links")
+SERVICE_KEY_SUFFIXES = tuple(f"_{field}" for field, _ in SCALAR_FIELDS) + tuple(
+    f"_{field}" for field in LIST_FIELDS
+)
 
 # ---------------------------------------------------------------------------
 # Handle deferred base64 load (populate session_state before widgets build)
@@ -48,30 +72,30 @@ config = load_config()
 if "pending_load" in st.session_state:
     loaded = st.session_state.pop("pending_load")
 
+    # Collect every value first and write them to session state in one update.
+    updates = {}
+
     # Basic fields
     if "release_date" in loaded:
         try:
-            st.session_state["release_date"] = date.fromisoformat(loaded["release_date"])
+            updates["release_date"] = date.fromisoformat(loaded["release_date"])
         except Exception:
             pass
     if "contact" in loaded:
-        st.session_state["contact"] = loaded["contact"]
+        updates["contact"] = loaded["contact"]
 
-    # Services selections and per-service data
+    # Services selections and per-service data.  Tuple defaults avoid
+    # allocating an empty list for each missing link field.
     services_loaded = loaded.get("services", {})
-    st.session_state["selected_services"] = list(services_loaded.keys())
+    updates["selected_services"] = list(services_loaded.keys())
 
     for svc, details in services_loaded.items():
-        st.session_state[f"{svc}_config_only"] = details.get("config_only", False)
-        st.session_state[f"{svc}_risk_level"] = details.get("risk_level", "Low")
-        st.session_state[f"{svc}_benefit_level"] = details.get("benefit_level", "Low")
-        st.session_state[f"{svc}_version"] = details.get("version", "")
-        st.session_state[f"{svc}_known_issues"] = details.get("known_issues", "")
-        st.session_state[f"{svc}_pr_links"] = "\n".join(details.get("pr_links", []))
-        st.session_state[f"{svc}_change_description"] = details.get("change_description", "")
-        st.session_state[f"{svc}_design_links"] = "\n".join(details.get("design_links", []))
-        st.session_state[f"{svc}_code_quality_links"] = "\n".join(details.get("code_quality_links", []))
-        st.session_state[f"{svc}_additional_links"] = "\n".join(details.get("additional_links", []))
+        prefix = f"{svc}_"
+        for field, default in SCALAR_FIELDS:
+            updates[prefix + field] = details.get(field, default)
+        for field in LIST_FIELDS:
+            updates[prefix + field] = "\n".join(details.get(field, ()))
+    st.session_state.update(updates)
 
 
 # ---------------------------------------------------------------------------
@@ -96,8 +120,11 @@ st.markdown(
 
 # Clear form button
 if st.button("Clear Form", type="primary"):
-    for key in list(st.session_state.keys()):
-        del st.session_state[key]
+    for svc in st.session_state.get("selected_services", ()):
+        for suffix in SERVICE_KEY_SUFFIXES:
+            st.session_state.pop(f"{svc}{suffix}", None)
+    for key in FORM_KEYS:
+        st.session_state.pop(key, None)
 
 # ---------------------------------------------------------------------------
 # Basic inputs
@@ -111,128 +138,163 @@ release_date = st.date_input(
     "Release note date", value=st.session_state["release_date"], key="release_date"
 )
 
-contact = st.selectbox(
-    "Point of contact", config.get("contacts", {}).get("names", []), key="contact"
-)
-
-services = config.get("services", {}).get("names", [])
+contact = st.selectbox("Point of contact", CONTACTS, key="contact")
 
-selected_services = st.multiselect("Select services", services, key="selected_services")
+selected_services = st.multiselect("Select services", SERVICES, key="selected_services")
 
 # Add spacing before tabs
 st.markdown("<div style='margin-top:1.25rem'></div>", unsafe_allow_html=True)
 
 # ---------------------------------------------------------------------------
-# Build per-service UI & assemble JSON
+# Per-service UI, JSON preview & base64 export/import
 # ---------------------------------------------------------------------------
 
 
-form_data = {"release_date": release_date.isoformat(), "contact": contact, "services": {}}
-
-
-def _parse_links(text: str):
-    return [l.strip() for l in text.splitlines() if l.strip()]
-
-
-if selected_services:
-    tabs = st.tabs(selected_services)
-
-    for tab, svc in zip(tabs, selected_services):
-        with tab:
-            st.subheader(svc)
-
-            config_only = st.checkbox("Config only", key=f"{svc}_config_only")
-
-            # Move change description above risk level
-            change_description = st.text_area(
-                "Change description", key=f"{svc}_change_description"
-            )
-
-            # Risk level selection
-            risk_level = st.selectbox(
-                "Risk level",
-                ["Low", "Medium", "High"],
-                key=f"{svc}_risk_level",
-                help=(
-                    "Low – simple change, config only or small function tweaks.\n"
-                    "Medium – more significant changes to larger application components.\n"
-                    "High – major changes across multiple components or non-backwards compatible modifications."
-                ),
-            )
+def _render_service_tab(svc: str):
+    """Render the widgets for one service.
 
-            # Explanatory caption for selected risk level.
-            risk_info_map = {
-                "Low": "Simple change, config only or small function tweaks.",
-                "Medium": "More significant changes to larger application components.",
-                "High": "Major changes across multiple components or non-backwards-compatible modifications.",
-            }
-            st.caption(f"{risk_level}: {risk_info_map.get(risk_level, '')}")
-
-            # Benefit delivered by change (shown below risk description)
-            benefit_level = st.selectbox(
-                "Benefit delivered by change",
-                ["Low", "Medium", "High"],
-                key=f"{svc}_benefit_level",
-                help=(
-                    "Low – Minor improvements or maintenance.\n"
-                    "Medium – Noticeable value or efficiency gains.\n"
-                    "High – Significant new features or major customer impact."
-                ),
-            )
+    Values are read back from `st.session_state` when the JSON is assembled, so
+    nothing needs returning.
+    """
 
-            # Additional per-service fields
-            version = st.text_input("Version", key=f"{svc}_version")
+    st.subheader(svc)
+
+    st.checkbox("Config only", key=f"{svc}_config_only")
+
+    # Move change description above risk level
+    st.text_area("Change description", key=f"{svc}_change_description")
+
+    # Risk level selection
+    risk_level = st.selectbox(
+        "Risk level",
+        ["Low", "Medium", "High"],
+        key=f"{svc}_risk_level",
+        help=(
+            "Low – simple change, config only or small function tweaks.\n"
+            "Medium – more significant changes to larger application components.\n"
+            "High – major changes across multiple components or non-backwards compatible modifications."
+        ),
+    )
+
+    # Explanatory caption for selected risk level.
+    risk_info_map = {
+        "Low": "Simple change, config only or small function tweaks.",
+        "Medium": "More significant changes to larger application components.",
+        "High": "Major changes across multiple components or non-backwards-compatible modifications.",
+    }
+    st.caption(f"{risk_level}: {risk_info_map.get(risk_level, '')}")
+
+    # Benefit delivered by change (shown below risk description)
+    st.selectbox(
+        "Benefit delivered by change",
+        ["Low", "Medium", "High"],
+        key=f"{svc}_benefit_level",
+        help=(
+            "Low – Minor improvements or maintenance.\n"
+            "Medium – Noticeable value or efficiency gains.\n"
+            "High – Significant new features or major customer impact."
+        ),
+    )
+
+    # Additional per-service fields
+    st.text_input("Version", key=f"{svc}_version")
+
+    st.text_area("Known issues, risks and mitigations", key=f"{svc}_known_issues")
+    st.text_area("PR links (one per line)", key=f"{svc}_pr_links")
+    st.text_area("Design links (one per line)", key=f"{svc}_design_links")
+    st.text_area("Code quality links (one per line)", key=f"{svc}_code_quality_links")
+    st.text_area("Additional links (one per line)", key=f"{svc}_additional_links")
+
+
+def _service_values(svc: str):
+    """Return one service's slice of the JSON representation from `st.session_state`."""
+
+    state = st.session_state
+    prefix = f"{svc}_"
+    data = {}
+    for field, default in SCALAR_FIELDS:
+        data[field] = state.get(prefix + field, default)
+    for field in LIST_FIELDS:
+        data[field] = parse_links(state.get(prefix + field, ""))
+    return data
+
+
+@fragment
+def _service_editor(release_date: date, contact: str, selected_services: list):
+    """Service panels, JSON preview and base64 export/import.
+
+    Everything that depends on the per-service widgets lives in this one
+    fragment, so editing a field reruns only this part of the page and the
+    preview still updates with it.  The basic inputs above sit outside it;
+    changing one of those reruns the whole page with fresh arguments.
+    """
 
-            known_issues = st.text_area(
-                "Known issues, risks and mitigations", key=f"{svc}_known_issues"
-            )
-            pr_links = st.text_area("PR links (one per line)", key=f"{svc}_pr_links")
-            design_links = st.text_area("Design links (one per line)", key=f"{svc}_design_links")
-            code_quality_links = st.text_area(
-                "Code quality links (one per line)", key=f"{svc}_code_quality_links"
-            )
-            additional_links = st.text_area(
-                "Additional links (one per line)", key=f"{svc}_additional_links"
+    if len(selected_services) > MAX_SERVICE_TABS:
+        # Tabs render every panel on each rerun; with many services only render
+        # the one being edited.
+        active_service = st.selectbox(
+            "Service to edit", selected_services, key="_active_svc"
+        )
+
+        # Streamlit drops the state of widgets that are not rendered in a run.
+        # Re-assigning the hidden services' keys keeps their values around.
+        for svc in selected_services:
+            if svc == active_service:
+                continue
+            for suffix in SERVICE_KEY_SUFFIXES:
+                key = f"{svc}{suffix}"
+                if key in st.session_state:
+                    st.session_state[key] = st.session_state[key]
+
+        with st.container(border=True):
+            _render_service_tab(active_service)
+    elif selected_services:
+        tabs = st.tabs(selected_services)
+
+        for tab, svc in zip(tabs, selected_services):
+            with tab:
+                _render_service_tab(svc)
+
+    # Assemble the JSON from session state – every edit reruns this fragment, so
+    # the preview below always reflects the current form.
+    form_data = {"release_date": release_date.isoformat(), "contact": contact, "services": {}}
+
+    for svc in selected_services:
+        form_data["services"][svc] = _service_values(svc)
+
+    # Collapsed tree view – the frontend only expands nodes on demand, so no JSON
+    # string needs to be built on every rerun.  Skipped entirely until there is a
+    # service to show.
+    if selected_services:
+        with st.expander("Form Data JSON"):
+            st.json(form_data, expanded=False)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if st.button("Export to base64", type="secondary"):
+            # Compact JSON (no indentation) keeps the export roughly half the size.
+            payload = base64.b64encode(json_dumps(form_data))
+            st.download_button(
+                "Download base64", payload, file_name="form.b64", mime="text/plain"
             )
-
-            form_data["services"][svc] = {
-                "config_only": config_only,
-                "risk_level": risk_level,
-                "benefit_level": benefit_level,
-                "version": version,
-                "known_issues": known_issues,
-                "change_description": change_description,
-                "pr_links": _parse_links(pr_links),
-                "design_links": _parse_links(design_links),
-                "code_quality_links": _parse_links(code_quality_links),
-                "additional_links": _parse_links(additional_links),
-            }
-
-
-# ---------------------------------------------------------------------------
-# Show JSON & base64 export/import
-# ---------------------------------------------------------------------------
-
-
-st.write("### Form Data JSON")
-json_str = json.dumps(form_data, indent=2)
-st.code(json_str, language="json")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    if st.button("Export to base64", type="secondary"):
-        b64 = base64.b64encode(json_str.encode()).decode()
-        st.text_area("Base64 Encoded JSON", b64, height=200, key="export_b64")
-
-with col2:
-    input_b64 = st.text_area("Paste Base64", key="input_b64", height=200)
-    if st.button("Load from base64"):
-        try:
-            decoded = base64.b64decode(input_b64).decode()
-            data = json.loads(decoded)
-
-            st.session_state["pending_load"] = data
-            _safe_rerun()
-        except Exception as e:
-            st.error(f"Error loading data: {e}")
+            # `st.code` has a copy button for pasting into the consolidator without
+            # the overhead of an editable text area widget.
+            st.code(payload.decode(), language=None)
+
+    with col2:
+        input_b64 = st.text_area("Paste Base64", key="input_b64", height=200)
+        if st.button("Load from base64"):
+            try:
+                decoded = base64.b64decode(input_b64)
+                data = json_loads(decoded)
+
+                st.session_state["pending_load"] = data
+                # Reruns the whole page, not just this fragment, so the
+                # hydration block at the top runs before any widget is built.
+                safe_rerun()
+            except Exception as e:
+                st.error(f"Error loading data: {e}")
+
+
+_service_editor(release_date, contact, selected_services)
@@ -0,0 +1 @@
+"""Shared helpers for the Reno Streamlit pages."""
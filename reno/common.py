@@ -0,0 +1,130 @@
+"""
+Reno – helpers shared by the Streamlit pages.
+
+Holds the Streamlit compatibility shims (`safe_rerun`, `fragment`), the
+optional-orjson JSON backend (`json_dumps` / `json_loads`), the cached
+`config.toml` loader and the link-list parser used by the generator form.
+"""
+
+import json
+import os
+import pickle
+from functools import lru_cache
+
+import streamlit as st
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
+try:
+    import orjson
+except ModuleNotFoundError:  # Optional speed-up – see README.
+    orjson = None
+
+
+# ---------------------------------------------------------------------------
+# Streamlit version compatibility
+# ---------------------------------------------------------------------------
+
+
+def safe_rerun():
+    """Trigger a script rerun using whichever API is available."""
+
+    if hasattr(st, "rerun"):
+        st.rerun()
+    else:
+        st.experimental_rerun()
+
+
+# `st.fragment` (Streamlit >= 1.37) reruns only the decorated function when a
+# widget inside it changes.  Older versions fall back to the experimental name,
+# or to a plain function call.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+if fragment is None:
+    def fragment(func):
+        return func
+
+
+# ---------------------------------------------------------------------------
+# JSON backend
+# ---------------------------------------------------------------------------
+
+
+# orjson is used when installed; otherwise the stdlib json module is used with
+# the same bytes-in / bytes-out interface (compact output, UTF-8 input).
+if orjson is not None:
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+else:
+    _JSON_DECODER = json.JSONDecoder()
+
+    def json_dumps(data) -> bytes:
+        """Serialise `data` to compact JSON bytes."""
+
+        return json.dumps(data, separators=(",", ":")).encode()
+
+    def json_loads(raw: bytes):
+        """Parse UTF-8 encoded JSON bytes."""
+
+        return _JSON_DECODER.decode(raw.decode("utf-8"))
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+
+CONFIG_PATH = "config.toml"
+CONFIG_CACHE_PATH = CONFIG_PATH + ".cache.pkl"
+
+
+@st.cache_data
+def load_config():
+    """Return the parsed config, reusing a pickled copy while it is fresh.
+
+    The sidecar stores ``(mtime_ns, size, data)`` so that any edit to
+    ``config.toml`` invalidates it on the next cold start.
+    """
+
+    stat = os.stat(CONFIG_PATH)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    try:
+        with open(CONFIG_CACHE_PATH, "rb") as f:
+            mtime_ns, size, data = pickle.load(f)
+        if (mtime_ns, size) == stamp:
+            return data
+    except Exception:
+        pass  # Missing / stale / unreadable cache – fall back to parsing.
+
+    with open(CONFIG_PATH, "rb") as f:
+        data = tomllib.load(f)
+
+    tmp_path = f"{CONFIG_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump((*stamp, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, CONFIG_CACHE_PATH)
+    except OSError:
+        # Read-only checkout or similar – the cache is only an optimisation.
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    return data
+
+
+# ---------------------------------------------------------------------------
+# Form helpers
+# ---------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=256)
+def parse_links(text: str):
+    """Split a one-link-per-line text area into a tuple of non-empty links."""
+
+    # Tuples keep the cached value immutable; json.dumps renders them as lists.
+    return tuple(l.strip() for l in text.splitlines() if l.strip())